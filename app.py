@@ -150,10 +150,24 @@ else:
     st.warning("Macro theme data not yet available.")
 
 
-# 🔮 AI Insights - placeholder
+# 🔮 AI Insights
+# Generation runs in the background; the page only ever reads the cached insight
+from insights_service import build_snapshot, refresh_insights
 st.markdown("---")
 st.header("🔮 AI Insights")
-st.info("Coming soon — AI-generated macroeconomic interpretations.")
+
+insights = refresh_insights(build_snapshot(btc_df, inflation_df, ir_df, emp_df))
+if insights["insight"]:
+    st.markdown(insights["insight"]["insight"])
+    st.caption(f"Generated {insights['insight']['generated_at']} from: " + " ".join(insights["insight"]["changes"]))
+    if insights["updating"]:
+        st.caption("🔄 New data detected — an updated insight is being generated and will appear on the next refresh.")
+elif insights["updating"]:
+    st.info("🔄 Generating the first AI insight from the latest data — it will appear on the next refresh.")
+elif insights["failed"]:
+    st.warning("AI insight generation failed for the latest data. It will be retried later.")
+else:
+    st.info("No AI insight yet — waiting for economic data.")
 
 
 # Footer
@@ -0,0 +1,274 @@
+import os
+import json
+import hashlib
+import time
+import datetime
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from git_service import iter_new_commits
+from llm_service import generate_social_media_post
+from main_automation import PLATFORMS, get_post_result, make_post_record
+from state_service import CommitProgress, load_state
+
+# --- Configuration ---
+BATCH_WORKERS = 8 # Maximum number of concurrent LLM calls across all repositories
+REQUESTS_PER_MINUTE = 60 # Shared LLM quota for the whole batch (0 disables rate limiting)
+BATCH_OUTPUT_FILE = 'batch_posts.jsonl' # Generated posts from all repositories, one JSON line each
+BATCH_REPORT_FILE = 'batch_report.json' # Consolidated summary of the batch run
+BATCH_STATE_DIR = 'batch_state' # Per-repository state files, created next to the manifest
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls evenly so all workers share one requests-per-minute quota.
+    """
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self) -> None:
+        """Blocks until the caller may make the next request."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def load_manifest(manifest_path: str) -> list:
+    """
+    Loads the list of repositories to process from a JSON manifest.
+
+    The manifest is either a list or an object with a 'repositories' list. Each entry is a path
+    string or an object with a 'path' and an optional 'name'. Relative paths are resolved against
+    the manifest's directory.
+
+    Returns:
+        list: A list of dictionaries with the keys 'name' and 'path'.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    entries = manifest.get("repositories", []) if isinstance(manifest, dict) else manifest
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    repositories = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        path = os.path.normpath(os.path.join(base_dir, entry["path"]))
+        repositories.append({"name": entry.get("name") or os.path.basename(path), "path": path})
+    return repositories
+
+def get_state_file(manifest_path: str, repo_path: str) -> str:
+    """
+    Returns the state file of a repository in the batch state directory next to the manifest.
+
+    State is kept outside the managed repositories so it never shows up in their working trees.
+    The file name combines the directory name with a hash of the full path, so repositories that
+    share a directory name get separate state.
+    """
+    state_dir = os.path.join(os.path.dirname(os.path.abspath(manifest_path)), BATCH_STATE_DIR)
+    path_hash = hashlib.sha1(repo_path.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(state_dir, f"{os.path.basename(repo_path)}-{path_hash}.json")
+
+def _open_repository(repo: dict, state_file: str, on_commit) -> dict:
+    """
+    Loads the state of one repository and prepares streaming its new commits.
+
+    Commits are read lazily from a streamed 'git log' whose working directory is the repository,
+    so repositories never interfere with each other and no repository's backlog is held in memory.
+    The 'git log' process only starts when the first commit is requested.
+    """
+    if not os.path.exists(os.path.join(repo["path"], '.git')):
+        raise ValueError(f"'{repo['path']}' is not a Git repository.")
+
+    state = load_state(state_file)
+    return {
+        "progress": CommitProgress(state, state_file, on_commit=on_commit),
+        "commits": iter_new_commits(repo["path"], since_commit=state["last_commit"]),
+        "tasks": deque(),
+    }
+
+def _next_task(repo_path: str, repo: dict):
+    """
+    Returns the next (repo_path, index, commit, platform, day_number) task of a repository, reading
+    further commits only when needed, or None once the repository is exhausted or has a failed post.
+    """
+    while not repo["tasks"]:
+        if repo["commits"] is None:
+            return None
+        commit = next(repo["commits"], None) if not repo["progress"].failed else None
+        if commit is None:
+            repo["commits"].close()
+            repo["commits"] = None
+            return None
+        # Merge, empty or delete-only commits have nothing to post about, but still count as processed
+        platforms = PLATFORMS if commit["diff"].strip() else []
+        index, day_number = repo["progress"].add(commit["sha"], len(platforms))
+        repo["tasks"].extend((repo_path, index, commit, platform, day_number) for platform in platforms)
+    if repo["progress"].failed:
+        repo["tasks"].clear()
+        return None
+    return repo["tasks"].popleft()
+
+def _generate(limiter: RateLimiter, diff: str, platform: str, day_number: int) -> str:
+    limiter.acquire()
+    return generate_social_media_post(diff, platform, day_number)
+
+def run_batch(manifest_path: str, workers: int = BATCH_WORKERS, requests_per_minute: int = REQUESTS_PER_MINUTE,
+              output_file: str = BATCH_OUTPUT_FILE, report_file: str = BATCH_REPORT_FILE) -> dict:
+    """
+    Generates posts for the new commits of every repository listed in a manifest.
+
+    Each repository's commits are streamed lazily from its own 'git log', with at most `workers`
+    repositories streaming at a time, and post generation for all repositories runs on one thread
+    pool with at most `workers * 2` tasks queued. Tasks are taken round-robin across the streaming
+    repositories and every LLM call goes through a shared rate limiter, so the quota is split
+    fairly. A commit's posts are appended to `output_file` once its repository's state (kept next
+    to the manifest) records the commit, so retries never duplicate posts. A failed post stops that
+    repository for this run, and an error in one repository (e.g. an unreachable stored commit) is
+    recorded in its report entry without affecting the others. A consolidated report is written
+    to `report_file`.
+
+    Returns:
+        dict: The consolidated report.
+    """
+    print("--- Starting Multi-Repository Batch Run ---")
+    started = time.monotonic()
+    repositories = load_manifest(manifest_path)
+    print(f"Repositories in manifest: {len(repositories)}")
+
+    # 1. Set up a report entry per repository; keyed by resolved path, since directory names can repeat
+    reports = {}
+    waiting = deque()
+    for repo in repositories:
+        if repo["path"] in reports:
+            print(f"Warning: '{repo['path']}' is listed more than once in the manifest. Skipping the duplicate.")
+            continue
+        reports[repo["path"]] = {"name": repo["name"], "path": repo["path"], "commits": 0, "posts": 0,
+                                 "failed": False, "error": None, "last_commit": None, "day_number": None}
+        waiting.append(repo)
+    os.makedirs(os.path.join(os.path.dirname(os.path.abspath(manifest_path)), BATCH_STATE_DIR), exist_ok=True)
+
+    # 2. Generate posts fairly across repositories under the shared rate limit
+    limiter = RateLimiter(requests_per_minute)
+    max_streaming = max(1, workers) # Each streaming repository holds a 'git log' process and its pipes
+    repos = {} # Every opened repository, kept until the report is written
+    active = deque() # Repositories whose commits are still being streamed, in round-robin order
+    in_flight = {}
+
+    with open(output_file, 'a', encoding='utf-8') as out, ThreadPoolExecutor(max_workers=workers) as executor:
+        def writer(repo_path):
+            def write_records(records):
+                for record in records:
+                    record["repository"] = reports[repo_path]["name"]
+                    record["repository_path"] = repo_path
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                reports[repo_path]["posts"] += len(records)
+            return write_records
+
+        def open_next():
+            while waiting and len(active) < max_streaming:
+                repo = waiting.popleft()
+                try:
+                    repos[repo["path"]] = _open_repository(repo, get_state_file(manifest_path, repo["path"]),
+                                                           writer(repo["path"]))
+                    active.append(repo["path"])
+                except Exception as e:
+                    print(f"❌ Could not read repository '{repo['name']}': {e}")
+                    reports[repo["path"]]["error"] = str(e)
+
+        def stop(repo_path, error=None):
+            repo = repos[repo_path]
+            if repo["commits"] is not None:
+                repo["commits"].close()
+                repo["commits"] = None
+            repo["tasks"].clear()
+            if error is not None:
+                print(f"❌ Error in repository '{reports[repo_path]['name']}': {error}")
+                reports[repo_path]["error"] = str(error)
+
+        def collect(done_futures):
+            for future in done_futures:
+                repo_path, index, commit, platform, day_number = in_flight.pop(future)
+                name = reports[repo_path]["name"]
+                post = get_post_result(future)
+                if post is None:
+                    repos[repo_path]["progress"].fail(index)
+                    print(f"  ❌ {name}: Day {day_number} ({commit['sha'][:7]}) {platform} post failed.")
+                    continue
+                repos[repo_path]["progress"].done(index, make_post_record(commit, platform, day_number, post))
+                print(f"  ✅ {name}: Day {day_number} ({commit['sha'][:7]}) {platform} post generated.")
+
+        open_next()
+        while active:
+            repo_path = active.popleft()
+            # Wait before reading the next commit, so only a bounded number of diffs is ever held in memory
+            while len(in_flight) >= workers * 2:
+                done_futures, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done_futures)
+            try:
+                task = _next_task(repo_path, repos[repo_path])
+            except Exception as e:
+                stop(repo_path, e)
+                task = None
+            if task is None:
+                # This repository is finished; let the next waiting one start streaming
+                open_next()
+                continue
+            future = executor.submit(_generate, limiter, task[2]["diff"], task[3], task[4])
+            in_flight[future] = task
+            active.append(repo_path)
+
+        while in_flight:
+            done_futures, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done_futures)
+
+    # 3. Write the consolidated report
+    for repo_path, repo in repos.items():
+        report = reports[repo_path]
+        report["commits"] = repo["progress"].processed_commits
+        report["failed"] = repo["progress"].failed
+        report["last_commit"] = repo["progress"].state["last_commit"]
+        report["day_number"] = repo["progress"].state["day_number"]
+    repo_reports = list(reports.values())
+
+    batch_report = {
+        "generated_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        "manifest": os.path.abspath(manifest_path),
+        "workers": workers,
+        "requests_per_minute": requests_per_minute,
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+        "total_commits": sum(r["commits"] for r in repo_reports),
+        "total_posts": sum(r["posts"] for r in repo_reports),
+        "output_file": os.path.abspath(output_file),
+        "repositories": repo_reports,
+    }
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(batch_report, f, indent=2, ensure_ascii=False)
+
+    print("\n--- Batch Run Finished ---")
+    for report in repo_reports:
+        status = f"❌ {report['error']}" if report["error"] else f"{report['commits']} commits, {report['posts']} posts"
+        if report["failed"]:
+            status += " (❌ stopped after a failed post, retried next run)"
+        print(f"  {report['name']}: {status}")
+    print(f"Report written to '{report_file}' ({batch_report['elapsed_seconds']}s).")
+    return batch_report
+
+if __name__ == "__main__":
+    # Same as 'python cli.py batch <manifest>'
+    import argparse
+    from cli import add_batch_arguments
+
+    parser = argparse.ArgumentParser(description="Generate social media posts for many Git repositories at once.")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    run_batch(args.manifest, **{name: value for name, value in vars(args).items() if name != 'manifest' and value is not None})
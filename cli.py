@@ -0,0 +1,82 @@
+import os
+import argparse
+from git_service import GitCommandError, get_head_commit
+from state_service import REPO_PATH, STATE_FILE, load_state
+
+# Unified entry point: 'python cli.py' (or 'run'), 'python cli.py catch-up' and 'python cli.py batch <manifest>'.
+# Only the standard library, git_service and state_service are imported up front. The automation
+# modules (and through them the LLM client and config loading) are imported only once a run is known
+# to have new commits, so the usual "nothing new" cron/CI invocation exits in a few tens of milliseconds.
+
+def has_new_commits(repo_path: str = REPO_PATH) -> bool:
+    """
+    Cheaply checks whether HEAD has moved since the last processed commit.
+
+    Returns True if HEAD cannot be resolved, so the full run reports the actual problem.
+    """
+    head_commit = get_head_commit(repo_path)
+    if not head_commit:
+        return True
+    return head_commit != load_state(os.path.join(repo_path, STATE_FILE))["last_commit"]
+
+def add_catch_up_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the catch-up options. Unset options fall back to main_automation's defaults."""
+    parser.add_argument('--workers', type=int,
+                        help="Maximum number of concurrent LLM calls.")
+    parser.add_argument('--output', dest='output_file',
+                        help="File that results are appended to (JSON lines).")
+
+def add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the batch options. Unset options fall back to batch_runner's defaults."""
+    parser.add_argument('manifest', help="JSON manifest listing the repositories to process.")
+    parser.add_argument('--workers', type=int,
+                        help="Maximum number of concurrent LLM calls across all repositories.")
+    parser.add_argument('--requests-per-minute', type=int,
+                        help="Shared LLM quota for the whole batch (0 disables rate limiting).")
+    parser.add_argument('--output', dest='output_file',
+                        help="File that generated posts are appended to (JSON lines).")
+    parser.add_argument('--report', dest='report_file',
+                        help="File the consolidated JSON report is written to.")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate social media posts from Git commits.")
+    subparsers = parser.add_subparsers(dest='command')
+
+    subparsers.add_parser('run', help="Generate posts for the latest commits (default).")
+    add_catch_up_arguments(subparsers.add_parser(
+        'catch-up', help="Generate posts for every commit since the last processed one."))
+    add_batch_arguments(subparsers.add_parser(
+        'batch', help="Generate posts for every repository in a manifest."))
+    return parser
+
+def main(argv: list = None) -> int:
+    """Entry point for all automation commands. Returns the process exit code."""
+    args = build_parser().parse_args(argv)
+    command = args.command or 'run'
+
+    # Options left unset fall back to the defaults of the module that runs the command
+    options = {name: value for name, value in vars(args).items() if name not in ('command', 'manifest') and value is not None}
+
+    if command == 'batch':
+        from batch_runner import run_batch
+        run_batch(args.manifest, **options)
+        return 0
+
+    if not has_new_commits(REPO_PATH):
+        print("No new commits since the last run. Nothing to do.")
+        return 0
+
+    try:
+        if command == 'catch-up':
+            from main_automation import run_catch_up
+            run_catch_up(repo_path=REPO_PATH, **options)
+        else:
+            from main_automation import run_automation
+            run_automation()
+    except GitCommandError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
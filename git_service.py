@@ -1,5 +1,4 @@
 import subprocess
-import os
 
 def get_git_diff(repo_path: str = '.', previous_commit: str = 'HEAD~1', current_commit: str = 'HEAD') -> str:
     """
@@ -16,20 +15,14 @@ def get_git_diff(repo_path: str = '.', previous_commit: str = 'HEAD~1', current_
         str: The Git diff output as a string, or an empty string if an error occurs.
     """
     try:
-        # Change the working directory to the repository path
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
-
         # Construct the Git diff command
         # --unified=0: Shows no context lines, focusing only on changed lines.
         # --diff-filter=d: Excludes deleted files from the diff (we're interested in added/modified).
         command = ['git', 'diff', f'{previous_commit}..{current_commit}', '--unified=0', '--diff-filter=d']
         
-        # Execute the command, explicitly setting encoding to UTF-8 for Windows compatibility issues
-        result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-        
-        # Return to the original directory
-        os.chdir(original_cwd)
+        # Execute the command inside the repository without changing the process working directory,
+        # so several repositories can be diffed concurrently. UTF-8 is set explicitly for Windows compatibility.
+        result = subprocess.run(command, cwd=repo_path, capture_output=True, text=True, check=True, encoding='utf-8')
 
         return result.stdout
     except subprocess.CalledProcessError as e:
@@ -44,6 +37,147 @@ def get_git_diff(repo_path: str = '.', previous_commit: str = 'HEAD~1', current_
         print(f"❌ An unexpected error occurred: {e}")
         return ""
 
+class GitCommandError(RuntimeError):
+    """Raised when a Git command needed for post generation fails, so callers can report it instead of doing nothing."""
+
+def check_since_commit(repo_path: str, since_commit: str, current_commit: str = 'HEAD') -> None:
+    """
+    Verifies that the stored last processed commit still exists and is an ancestor of `current_commit`.
+
+    After a rebase or force-push the stored commit can become unreachable; diffing from it would
+    then fail or silently yield nothing, leaving the stored state stuck.
+
+    Raises:
+        GitCommandError: If the commit is missing or not an ancestor of `current_commit`.
+    """
+    try:
+        result = subprocess.run(['git', 'merge-base', '--is-ancestor', since_commit, current_commit], cwd=repo_path,
+                                capture_output=True, text=True, encoding='utf-8')
+    except FileNotFoundError:
+        raise GitCommandError("Git command not found. Please ensure Git is installed and in your system's PATH.")
+    if result.returncode == 1:
+        raise GitCommandError(f"Stored last commit {since_commit} is not an ancestor of {current_commit} in '{repo_path}' "
+                              f"(was the history rewritten?). Fix or remove the state file to continue.")
+    if result.returncode != 0:
+        raise GitCommandError(f"Stored last commit {since_commit} cannot be found in '{repo_path}': {result.stderr.strip()}")
+
+# Separators used in the 'git log' format so commit headers can be told apart from diff lines
+COMMIT_SEPARATOR = '\x1e'
+FIELD_SEPARATOR = '\x1f'
+
+def _without_deleted_files(diff_lines: list) -> str:
+    """Joins a commit's diff lines, leaving out the sections of deleted files (like '--diff-filter=d')."""
+    kept = []
+    section = []
+    for line in diff_lines + ['diff --git']:
+        if line.startswith('diff --git'):
+            if not any(section_line.startswith('deleted file mode') for section_line in section):
+                kept.extend(section)
+            section = []
+        section.append(line)
+    return ''.join(kept).strip('\n')
+
+def parse_git_log(lines):
+    """
+    Parses 'git log -p' output produced with the format used by iter_new_commits().
+
+    Every commit is yielded, including empty, merge and delete-only commits, whose 'diff' is
+    an empty string, so callers can still record them as processed.
+
+    Args:
+        lines: An iterable of output lines (with line endings).
+
+    Yields:
+        dict: A dictionary with the keys 'sha', 'subject' and 'diff' for each commit.
+    """
+    commit = None
+    diff_lines = []
+    for line in lines:
+        if line.startswith(COMMIT_SEPARATOR):
+            if commit is not None:
+                commit["diff"] = _without_deleted_files(diff_lines)
+                yield commit
+            sha, _, subject = line[1:].rstrip('\n').partition(FIELD_SEPARATOR)
+            commit = {"sha": sha, "subject": subject}
+            diff_lines = []
+        elif commit is not None:
+            diff_lines.append(line)
+    if commit is not None:
+        commit["diff"] = _without_deleted_files(diff_lines)
+        yield commit
+
+def iter_new_commits(repo_path: str = '.', since_commit: str = None, current_commit: str = 'HEAD'):
+    """
+    Lists all commits after `since_commit` together with their diffs using a single 'git log' call.
+
+    The output is streamed and parsed line by line, so memory use stays bounded even when
+    thousands of commits are waiting to be processed. Commits are yielded oldest first.
+
+    Args:
+        repo_path (str): The path to the Git repository. Defaults to the current directory.
+        since_commit (str): The last commit that was already processed. If None, only
+                            `current_commit` itself is returned.
+        current_commit (str): The newest commit to include. Defaults to HEAD.
+
+    Yields:
+        dict: A dictionary with the keys 'sha', 'subject' and 'diff' for each commit.
+
+    Raises:
+        GitCommandError: If `since_commit` is no longer an ancestor of `current_commit`, or 'git log' fails.
+    """
+    if since_commit:
+        check_since_commit(repo_path, since_commit, current_commit)
+
+    # --unified=0 matches get_git_diff(). Deleted files are dropped by the parser rather than with
+    # --diff-filter=d, because on 'git log' that filter would skip delete-only and empty commits entirely.
+    command = ['git', 'log', '--reverse', '-p', '--unified=0', '--no-color',
+               f'--format={COMMIT_SEPARATOR}%H{FIELD_SEPARATOR}%s']
+    if since_commit:
+        command.append(f'{since_commit}..{current_commit}')
+    else:
+        command.extend(['-n', '1', current_commit])
+
+    try:
+        process = subprocess.Popen(command, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, encoding='utf-8', errors='replace')
+    except FileNotFoundError:
+        raise GitCommandError("Git command not found. Please ensure Git is installed and in your system's PATH.")
+
+    with process:
+        yield from parse_git_log(process.stdout)
+        stderr = process.stderr.read()
+
+    if process.returncode != 0:
+        raise GitCommandError(f"Error executing Git command '{' '.join(command)}' in '{repo_path}': {stderr.strip()}")
+
+def get_head_commit(repo_path: str = '.') -> str:
+    """
+    Returns the full SHA of HEAD, or an empty string if it cannot be resolved.
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo_path, capture_output=True,
+                                text=True, check=True, encoding='utf-8')
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"❌ Could not resolve HEAD: {e}")
+        return ""
+
+def count_commits(repo_path: str = '.', since_commit: str = None, current_commit: str = 'HEAD') -> int:
+    """
+    Counts the commits after `since_commit` up to `current_commit` (all of history if None).
+
+    Returns:
+        int: The number of commits, or 0 if an error occurs.
+    """
+    revision = f'{since_commit}..{current_commit}' if since_commit else current_commit
+    try:
+        result = subprocess.run(['git', 'rev-list', '--count', revision], cwd=repo_path, capture_output=True,
+                                text=True, check=True, encoding='utf-8')
+        return int(result.stdout.strip())
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError) as e:
+        print(f"❌ Could not count commits: {e}")
+        return 0
+
 # Example Usage (for independent testing of this module)
 if __name__ == "__main__":
     # NOTE: This will only work if run inside a Git repository that has at least two commits.
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import hashlib
+import datetime
+import threading
+from llm_service import generate_market_insight
+
+# --- Configuration ---
+INSIGHTS_CACHE_FILE = 'insights_cache.json' # Generated insights keyed by data snapshot version
+MAX_CACHED_INSIGHTS = 20 # Older snapshot versions are dropped beyond this many
+RATE_MOVE_THRESHOLD = 0.10 # Fed funds change (percentage points) that counts as a rate move
+BTC_DRAWDOWN_THRESHOLD = -10.0 # BTC drawdown from its peak (%) that counts as meaningful
+BTC_MOVE_THRESHOLD = 10.0 # BTC price change (%) since the last insight that counts as meaningful
+FAILURE_COOLDOWN_SECONDS = 15 * 60 # A snapshot version whose generation failed is not retried before this
+
+# Background generation state, shared across Streamlit reruns because the module stays imported
+_lock = threading.Lock()
+_in_progress = set()
+
+def _latest(df, value_column: str) -> dict:
+    """Returns the latest date and value of a series (sorted by 'Date'), or None if there is no data."""
+    if df is None or df.empty or value_column not in df.columns:
+        return None
+    series = df.sort_values('Date')
+    latest = series.iloc[-1]
+    result = {"date": str(latest['Date'])[:10], "value": round(float(latest[value_column]), 4)}
+    if len(series) > 1:
+        result["previous"] = round(float(series.iloc[-2][value_column]), 4)
+    return result
+
+def build_snapshot(btc_df=None, inflation_df=None, rates_df=None, employment_df=None) -> dict:
+    """
+    Summarises the latest dashboard data into a small snapshot and its version.
+
+    Only the values insights are based on go into the snapshot, so the version changes exactly
+    when that data changes.
+
+    Returns:
+        dict: A dictionary with the keys 'version' (str) and 'data' (dict of series summaries).
+    """
+    data = {
+        "btc": _latest(btc_df, 'BTC Price (USD)'),
+        "cpi": _latest(inflation_df, 'Monthly Inflation (%)'),
+        "fed_funds": _latest(rates_df, 'Effective Federal Funds Rate (%)'),
+        "unemployment": _latest(employment_df, 'Unemployment Rate (%)'),
+    }
+    if data["btc"] is not None:
+        peak = float(btc_df['BTC Price (USD)'].max())
+        data["btc"]["drawdown_pct"] = round((data["btc"]["value"] / peak - 1) * 100, 2) if peak else 0.0
+
+    version = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return {"version": version, "data": data}
+
+def detect_changes(current: dict, baseline: dict = None) -> list:
+    """
+    Compares a snapshot's data with the data of the last generated insight.
+
+    Args:
+        current (dict): The 'data' part of the current snapshot.
+        baseline (dict): The 'data' part of the snapshot the latest insight was generated from,
+                         or None if no insight exists yet.
+
+    Returns:
+        list: Human-readable descriptions of the meaningful changes (empty if nothing meaningful changed).
+    """
+    baseline = baseline or {}
+    changes = []
+
+    cpi, old_cpi = current.get("cpi"), baseline.get("cpi")
+    if cpi and (not old_cpi or cpi["date"] != old_cpi["date"]):
+        previous = f" (previous {cpi['previous']:.2f}%)" if "previous" in cpi else ""
+        changes.append(f"New CPI print for {cpi['date']}: monthly inflation {cpi['value']:.2f}%{previous}.")
+
+    rate, old_rate = current.get("fed_funds"), baseline.get("fed_funds")
+    if rate:
+        reference = old_rate["value"] if old_rate else rate.get("previous")
+        # Rounded to the snapshot's precision, so a move of exactly the threshold counts despite float error
+        if reference is not None and round(abs(rate["value"] - reference), 4) >= RATE_MOVE_THRESHOLD:
+            direction = "rose" if rate["value"] > reference else "fell"
+            changes.append(f"Effective federal funds rate {direction} from {reference:.2f}% to {rate['value']:.2f}% ({rate['date']}).")
+        elif not old_rate:
+            changes.append(f"Effective federal funds rate is {rate['value']:.2f}% ({rate['date']}).")
+
+    jobs, old_jobs = current.get("unemployment"), baseline.get("unemployment")
+    if jobs and (not old_jobs or jobs["date"] != old_jobs["date"]):
+        changes.append(f"New unemployment print for {jobs['date']}: {jobs['value']:.1f}%.")
+
+    btc, old_btc = current.get("btc"), baseline.get("btc")
+    if btc:
+        if btc["drawdown_pct"] <= BTC_DRAWDOWN_THRESHOLD and (not old_btc or old_btc.get("drawdown_pct", 0) > BTC_DRAWDOWN_THRESHOLD):
+            changes.append(f"Bitcoin is in a {abs(btc['drawdown_pct']):.1f}% drawdown from its peak, at ${btc['value']:,.0f}.")
+        elif old_btc and old_btc["value"]:
+            move = (btc["value"] / old_btc["value"] - 1) * 100
+            if abs(move) >= BTC_MOVE_THRESHOLD:
+                changes.append(f"Bitcoin moved {move:+.1f}% to ${btc['value']:,.0f} since the last insight.")
+        elif not old_btc:
+            changes.append(f"Bitcoin trades at ${btc['value']:,.0f}.")
+
+    return changes
+
+def load_insights_cache(cache_file: str = INSIGHTS_CACHE_FILE) -> dict:
+    """Loads the insights cache, or an empty cache if the file is missing or invalid."""
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if isinstance(cache.get("insights"), dict):
+                cache.setdefault("failures", {})
+                return cache
+        except (ValueError, AttributeError):
+            print(f"Warning: '{cache_file}' contains invalid data. Starting with an empty insights cache.")
+    return {"latest": None, "insights": {}, "failures": {}}
+
+def _save_insights_cache(cache: dict, cache_file: str) -> None:
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, cache_file)
+
+def _generate_in_background(snapshot: dict, changes: list, cache_file: str, requested_at: float) -> None:
+    insight = None
+    try:
+        insight = generate_market_insight(changes)
+    except Exception as e:
+        print(f"❌ Error generating AI insight: {e}")
+
+    try:
+        with _lock:
+            cache = load_insights_cache(cache_file)
+            now = time.time()
+            # Forget failures whose cooldown has passed
+            cache["failures"] = {version: failed_at for version, failed_at in cache["failures"].items()
+                                 if now - failed_at < FAILURE_COOLDOWN_SECONDS}
+            if insight:
+                cache["failures"].pop(snapshot["version"], None)
+                cache["insights"][snapshot["version"]] = {
+                    "insight": insight,
+                    "changes": changes,
+                    "data": snapshot["data"],
+                    "requested_at": requested_at,
+                    "generated_at": datetime.datetime.now().isoformat(timespec='seconds'),
+                }
+                # Only move 'latest' forward, so a slow generation for older data never replaces a newer insight
+                latest = cache["insights"].get(cache["latest"])
+                if latest is None or latest.get("requested_at", 0) <= requested_at:
+                    cache["latest"] = snapshot["version"]
+                # Keep only the most recent versions
+                for version in sorted(cache["insights"], key=lambda v: cache["insights"][v].get("requested_at", 0))[:-MAX_CACHED_INSIGHTS]:
+                    if version != cache["latest"]:
+                        del cache["insights"][version]
+            else:
+                # Remember the failure so reruns with the same data do not call the LLM again right away
+                cache["failures"][snapshot["version"]] = now
+            _save_insights_cache(cache, cache_file)
+    except Exception as e:
+        print(f"❌ Error saving AI insight: {e}")
+    finally:
+        with _lock:
+            _in_progress.discard(snapshot["version"])
+
+def refresh_insights(snapshot: dict, cache_file: str = INSIGHTS_CACHE_FILE) -> dict:
+    """
+    Returns the most recent cached insight immediately and, if the data changed meaningfully,
+    starts generating a new one in a background thread.
+
+    No LLM call ever happens on the caller's thread. A snapshot version that is already cached or
+    being generated never triggers another generation, and neither does data whose changes since
+    the latest insight are all below the thresholds. A version whose generation failed is not
+    retried until FAILURE_COOLDOWN_SECONDS have passed.
+
+    Args:
+        snapshot (dict): The snapshot returned by build_snapshot().
+        cache_file (str): Path to the JSON insights cache.
+
+    Returns:
+        dict: A dictionary with the keys 'insight' (cached entry or None), 'is_current' (bool),
+              'updating' (bool, True while a newer insight is being generated) and 'failed'
+              (bool, True while a failed generation for this data is cooling down).
+    """
+    cache = load_insights_cache(cache_file)
+    latest = cache["insights"].get(cache["latest"])
+    result = {"insight": latest, "is_current": cache["latest"] == snapshot["version"], "updating": False, "failed": False}
+
+    if snapshot["version"] in cache["insights"]:
+        result["insight"] = cache["insights"][snapshot["version"]]
+        result["is_current"] = True
+        return result
+
+    failed_at = cache["failures"].get(snapshot["version"])
+    if failed_at is not None and time.time() - failed_at < FAILURE_COOLDOWN_SECONDS:
+        result["failed"] = True
+        return result
+
+    changes = detect_changes(snapshot["data"], latest["data"] if latest else None)
+    if not changes:
+        return result
+
+    with _lock:
+        if snapshot["version"] not in _in_progress:
+            _in_progress.add(snapshot["version"])
+            threading.Thread(target=_generate_in_background, args=(snapshot, changes, cache_file, time.time()),
+                             daemon=True).start()
+    result["updating"] = True
+    return result
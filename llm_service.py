@@ -1,6 +1,7 @@
 import os
-from dotenv import load_dotenv
-import requests
+
+# 'requests' and 'python-dotenv' are imported inside the functions that need them, so importing
+# this module stays cheap for runs that end up generating nothing.
 
 # Model to be used for generating messages
 LLM_MODEL = "HuggingFaceH4/zephyr-7b-beta"
@@ -12,6 +13,7 @@ def _get_hf_api_token():
     Helper function to load the Hugging Face API token from environment variables.
     """
     if not os.getenv("HF_API_TOKEN"):
+        from dotenv import load_dotenv
         load_dotenv()
     
     token = os.getenv("HF_API_TOKEN")
@@ -19,6 +21,52 @@ def _get_hf_api_token():
         raise ValueError("HF_API_TOKEN not found in environment variables. Please check your .env file.")
     return token
 
+def _chat_completion(messages: list, max_tokens: int, temperature: float) -> str:
+    """
+    Sends a chat completion request to the Hugging Face router.
+
+    Args:
+        messages (list): The chat messages (system and user) to send.
+        max_tokens (int): The maximum number of tokens to generate.
+        temperature (float): The sampling temperature.
+
+    Returns:
+        str: The generated text, or None if the request fails or returns no content.
+    """
+    import requests
+
+    payload = {
+        "messages": messages,
+        "model": LLM_MODEL,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "top_p": 0.9
+    }
+
+    try:
+        headers = {
+            "Authorization": f"Bearer {_get_hf_api_token()}",
+            "Content-Type": "application/json"
+        }
+        response = requests.post(API_URL, headers=headers, json=payload)
+        response.raise_for_status()
+        response_json = response.json()
+
+        if response_json and "choices" in response_json and response_json["choices"][0]["message"]["content"]:
+            return response_json["choices"][0]["message"]["content"].strip()
+        else:
+            print(f"❌ LLM did not return a valid response. Raw response: {response_json}")
+            return None
+    except requests.exceptions.RequestException as e:
+        print(f"❌ HTTP/Request Error during LLM call: {e}")
+        if hasattr(e, 'response') and e.response is not None:
+            print(f"Response status: {e.response.status_code}")
+            print(f"Response body: {e.response.text}")
+        return None
+    except Exception as e:
+        print(f"❌ General Error during LLM call: {e}")
+        return None
+
 def generate_social_media_post(git_diff_content: str, platform: str, day_number: int) -> str:
     """
     Generates a concise and engaging social media post based on Git diff content,
@@ -30,14 +78,9 @@ def generate_social_media_post(git_diff_content: str, platform: str, day_number:
         day_number (int): The current day number of the building process (e.g., 6).
 
     Returns:
-        str: The generated social media post.
+        str: The generated social media post, or None if generation fails (so callers never
+             mistake an error for a post).
     """
-    hf_api_token = _get_hf_api_token()
-    headers = {
-        "Authorization": f"Bearer {hf_api_token}",
-        "Content-Type": "application/json"
-    }
-
     # Updated system prompts with stronger constraints and specific instructions
     system_prompt_map = {
         "X": (
@@ -90,36 +133,38 @@ def generate_social_media_post(git_diff_content: str, platform: str, day_number:
     )
     
     # Adjusted max_tokens to give more room for Bluesky/Mastodon to complete thoughts
-    payload = {
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ],
-        "model": LLM_MODEL,
-        "max_tokens": 280 if platform == "X" else 400, # X has strict character limit, Bluesky/Mastodon more flexible
-        "temperature": 0.7,
-        "top_p": 0.9
-    }
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message}
+    ]
+    return _chat_completion(messages, max_tokens=280 if platform == "X" else 400, temperature=0.7) # X has strict character limit, Bluesky/Mastodon more flexible
 
-    try:
-        response = requests.post(API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        response_json = response.json()
+def generate_market_insight(changes: list) -> str:
+    """
+    Generates a short macroeconomic interpretation of the latest data changes.
 
-        if response_json and "choices" in response_json and response_json["choices"][0]["message"]["content"]:
-            return response_json["choices"][0]["message"]["content"].strip()
-        else:
-            print(f"❌ LLM did not return a valid response. Raw response: {response_json}")
-            return "Error generating post."
-    except requests.exceptions.RequestException as e:
-        print(f"❌ HTTP/Request Error during LLM call: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Response status: {e.response.status_code}")
-            print(f"Response body: {e.response.text}")
-        return "Error communicating with LLM API."
-    except Exception as e:
-        print(f"❌ General Error during LLM call: {e}")
-        return "An unexpected error occurred."
+    All detected changes are sent in a single prompt so one LLM call covers the whole data refresh.
+
+    Args:
+        changes (list): Human-readable descriptions of meaningful data changes
+                        (e.g. new CPI prints, rate moves, BTC drawdowns).
+
+    Returns:
+        str: The generated insight, or None if generation fails (so failures are never cached).
+    """
+    system_prompt = (
+        "You are a macroeconomic analyst writing for a personal economic dashboard. "
+        "Interpret the listed data changes in 3-5 concise sentences: what they signal together "
+        "and what a reader should watch next. Only use the facts provided; do not invent numbers. "
+        "Do not give investment advice."
+    )
+    user_message = "The latest dashboard data shows these changes:\n" + "\n".join(f"- {change}" for change in changes)
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message}
+    ]
+    return _chat_completion(messages, max_tokens=300, temperature=0.4)
 
 # Example Usage (for testing this module independently)
 if __name__ == "__main__":
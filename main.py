@@ -1,29 +1,46 @@
 import os
-from dotenv import load_dotenv
-import google.generativeai as genai
 from utils.git_utils import get_last_commit_diff, get_last_commit_message
 
-# Load environment variables from .env file
-load_dotenv()
+# --- API Keys ---
+# Populated by load_config(). Nothing is read from .env and no provider SDK is imported at
+# import time, so entry points that end up with nothing to do start fast.
 
-# --- Load API Keys ---
 # X (Twitter) API Keys
-X_API_KEY = os.getenv("X_API_KEY")
-X_API_SECRET = os.getenv("X_API_SECRET")
-X_ACCESS_TOKEN = os.getenv("X_ACCESS_TOKEN")
-X_ACCESS_TOKEN_SECRET = os.getenv("X_ACCESS_TOKEN_SECRET")
+X_API_KEY = None
+X_API_SECRET = None
+X_ACCESS_TOKEN = None
+X_ACCESS_TOKEN_SECRET = None
 
 # Google Gemini API Key
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GEMINI_API_KEY)
+GEMINI_API_KEY = None
 
 # Mastodon API Keys and Info
-MASTODON_BASE_URL = os.getenv("MASTODON_BASE_URL")
-MASTODON_ACCESS_TOKEN = os.getenv("MASTODON_ACCESS_TOKEN")
+MASTODON_BASE_URL = None
+MASTODON_ACCESS_TOKEN = None
 
 # Bluesky API Keys and Info
-BLUESKY_USERNAME = os.getenv("BLUESKY_USERNAME")
-BLUESKY_PASSWORD = os.getenv("BLUESKY_PASSWORD")
+BLUESKY_USERNAME = None
+BLUESKY_PASSWORD = None
+
+_config_loaded = False
+
+def load_config():
+    """Loads environment variables from the .env file into the API key settings above."""
+    global X_API_KEY, X_API_SECRET, X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET, GEMINI_API_KEY
+    global MASTODON_BASE_URL, MASTODON_ACCESS_TOKEN, BLUESKY_USERNAME, BLUESKY_PASSWORD, _config_loaded
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    X_API_KEY = os.getenv("X_API_KEY")
+    X_API_SECRET = os.getenv("X_API_SECRET")
+    X_ACCESS_TOKEN = os.getenv("X_ACCESS_TOKEN")
+    X_ACCESS_TOKEN_SECRET = os.getenv("X_ACCESS_TOKEN_SECRET")
+    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    MASTODON_BASE_URL = os.getenv("MASTODON_BASE_URL")
+    MASTODON_ACCESS_TOKEN = os.getenv("MASTODON_ACCESS_TOKEN")
+    BLUESKY_USERNAME = os.getenv("BLUESKY_USERNAME")
+    BLUESKY_PASSWORD = os.getenv("BLUESKY_PASSWORD")
+    _config_loaded = True
 
 # --- Verification (optional, for testing) ---
 def verify_env_variables():
@@ -72,10 +89,16 @@ def generate_summary_with_gemini(git_diff_content, commit_message):
     Returns:
         str: A summary of the changes, or None if generation fails.
     """
+    if not _config_loaded:
+        load_config()
     if not GEMINI_API_KEY:
         print("Gemini API key is not set. Cannot generate summary.")
         return None
 
+    # Imported here because the SDK is slow to import and only needed when generating
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+
     model = genai.GenerativeModel('gemini-pro')
     prompt = (
         f"Review the following Git commit details:\n\n"
@@ -101,6 +124,7 @@ def generate_summary_with_gemini(git_diff_content, commit_message):
 
 
 if __name__ == "__main__":
+    load_config()
     verify_env_variables()
 
     print("\n--- Testing Git Diff and Gemini Summary ---")
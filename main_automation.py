@@ -1,64 +1,184 @@
 import os
 import datetime
-from git_service import get_git_diff
+import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from git_service import check_since_commit, count_commits, get_git_diff, get_head_commit, iter_new_commits
 from llm_service import generate_social_media_post
+from state_service import REPO_PATH, STATE_FILE, CommitProgress, load_state, save_state
 
 # --- Configuration ---
-REPO_PATH = '.' # Path to your Git repository (current directory)
 PLATFORMS = ["X", "Bluesky", "Mastodon"] # Social media platforms to generate posts for
-DAY_COUNTER_FILE = 'day_counter.txt' # File to store the current day number
-
-def get_current_day_number():
-    """Reads the current day number from a file, increments it, and saves it back."""
-    day_number = 1
-    if os.path.exists(DAY_COUNTER_FILE):
-        with open(DAY_COUNTER_FILE, 'r') as f:
-            try:
-                day_number = int(f.read().strip())
-                day_number += 1 # Increment for the new day
-            except ValueError:
-                print(f"Warning: '{DAY_COUNTER_FILE}' contains invalid data. Starting day count from 1.")
-                day_number = 1
-    
-    with open(DAY_COUNTER_FILE, 'w') as f:
-        f.write(str(day_number))
-    return day_number
+CATCH_UP_OUTPUT_FILE = 'generated_posts.jsonl' # Catch-up results, one JSON line per generated post
+CATCH_UP_WORKERS = 4 # Maximum number of concurrent LLM calls in catch-up mode
 
 def run_automation():
     """Orchestrates the process of getting diff, generating posts, and printing them."""
     print("--- Starting Social Media Post Automation ---")
 
-    # 1. Get the current day number
-    day_number = get_current_day_number()
-    print(f"Current Day: {day_number}")
+    # 1. Load the state (cli.py has already skipped the run if HEAD was posted about)
+    state_file = os.path.join(REPO_PATH, STATE_FILE)
+    state = load_state(state_file)
+    head_commit = get_head_commit(REPO_PATH)
+
+    if state["last_commit"]:
+        # Fails loudly if the stored commit vanished (e.g. after a force-push) instead of posting nothing forever
+        check_since_commit(REPO_PATH, state["last_commit"], head_commit or 'HEAD')
+
+        # Several commits since the last run get one post (and one day number) each instead of being merged
+        pending = count_commits(REPO_PATH, since_commit=state["last_commit"], current_commit=head_commit or 'HEAD')
+        if pending > 1:
+            print(f"{pending} commits since the last run. Switching to catch-up mode: each commit gets its own "
+                  f"day number and its posts are appended to '{CATCH_UP_OUTPUT_FILE}'.")
+            run_catch_up(repo_path=REPO_PATH)
+            return
 
-    # 2. Retrieve Git diff
+    # 2. Retrieve Git diff since the last posted commit (or for the latest commit on the first run)
     print("Retrieving Git diff for latest changes...")
-    git_diff_content = get_git_diff(repo_path=REPO_PATH)
+    git_diff_content = get_git_diff(repo_path=REPO_PATH, previous_commit=state["last_commit"] or 'HEAD~1',
+                                    current_commit=head_commit or 'HEAD')
 
     if not git_diff_content:
+        if state["last_commit"] and head_commit:
+            # The range is valid, so the new commit is empty or only deletes files: record it without a new day
+            state["last_commit"] = head_commit
+            save_state(state, state_file)
+            print("The new commit has no changes to post about (empty or delete-only). Recorded it; no posts generated.")
+            return
         print("No significant Git changes detected or an error occurred while retrieving diff. No posts generated.")
         print("Please ensure you have new commits since the last run to generate a diff.")
-        # Revert day number if no diff generated so it doesn't increment unnecessarily
-        with open(DAY_COUNTER_FILE, 'w') as f:
-            f.write(str(day_number - 1 if day_number > 1 else 1)) # Revert to previous day or keep at 1
         return
 
+    # 3. Get the current day number, only once there is something to post about
+    day_number = state["day_number"] + 1
+    print(f"Current Day: {day_number}")
+
     print("Git diff successfully retrieved. Generating social media posts...")
 
-    # 3. Generate posts for each platform
+    # 4. Generate posts for each platform
     generated_posts = {}
     for platform in PLATFORMS:
         print(f"\n--- Generating Post for {platform} ---")
         post = generate_social_media_post(git_diff_content, platform, day_number)
+        if post is None:
+            print(f"❌ Failed to generate the {platform} post. The day counter and last commit are left unchanged so the next run retries.")
+            return
         generated_posts[platform] = post
         print(f"** {platform} Post **\n{post}")
         print("-" * 40) # Separator for readability
 
+    # Save the day and the commit that was posted about, so catch-up mode starts after it
+    state["day_number"] = day_number
+    if head_commit:
+        state["last_commit"] = head_commit
+    save_state(state, state_file)
+
     print("\n--- Automation Finished ---")
     print("Generated Posts Summary:")
     for platform, post in generated_posts.items():
         print(f"  {platform}: {len(post.encode('utf-8'))} bytes (approx. {len(post)} chars)") # Using bytes for X char limit check approximation
 
+def get_post_result(future):
+    """Returns the post of a finished generation future, or None if generation failed or raised."""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"❌ Error during post generation: {e}")
+        return None
+
+def make_post_record(commit: dict, platform: str, day_number: int, post: str) -> dict:
+    """Builds the JSON record written for one generated post in catch-up and batch mode."""
+    return {
+        "commit": commit["sha"],
+        "subject": commit["subject"],
+        "day_number": day_number,
+        "platform": platform,
+        "post": post,
+        "generated_at": datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+
+def run_catch_up(workers: int = CATCH_UP_WORKERS, output_file: str = CATCH_UP_OUTPUT_FILE, repo_path: str = REPO_PATH):
+    """
+    Generates posts for every commit made since the last processed commit.
+
+    All new commits and their diffs are read with a single streamed 'git log' call. Each commit
+    gets its own day number, and posts are generated with at most `workers` concurrent LLM calls.
+    A commit's posts are appended to `output_file` together, once the commit and every older one
+    have all their posts, right before the stored last commit moves past it. An interrupted run
+    therefore resumes without losing or duplicating commits. If a post fails (e.g. the LLM API is
+    rate limiting or down), no further commits are scheduled, the state stays before the failed
+    commit and the next run retries from there.
+
+    Raises:
+        GitCommandError: If the stored last commit is no longer reachable from HEAD or 'git log' fails.
+    """
+    print("--- Starting Commit Backlog Catch-Up ---")
+
+    state_file = os.path.join(repo_path, STATE_FILE)
+    state = load_state(state_file)
+    print(f"Last processed commit: {state['last_commit'] or 'none (only HEAD will be processed)'}")
+
+    in_flight = {}
+    processed = 0
+
+    def collect(done_futures, progress):
+        for future in done_futures:
+            index, commit, platform, day_number = in_flight.pop(future)
+            post = get_post_result(future)
+            if post is None:
+                progress.fail(index)
+                print(f"  ❌ Day {day_number} ({commit['sha'][:7]}) {platform} post failed.")
+                continue
+            progress.done(index, make_post_record(commit, platform, day_number, post))
+            print(f"  ✅ Day {day_number} ({commit['sha'][:7]}) {platform} post generated.")
+
+    with open(output_file, 'a', encoding='utf-8') as out, ThreadPoolExecutor(max_workers=workers) as executor:
+        def write_records(records):
+            nonlocal processed
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            processed += len(records)
+
+        progress = CommitProgress(state, state_file, on_commit=write_records)
+        for commit in iter_new_commits(repo_path, since_commit=state["last_commit"]):
+            if progress.failed:
+                break
+            # Merge, empty or delete-only commits have nothing to post about, but still count as processed
+            platforms = PLATFORMS if commit["diff"].strip() else []
+            index, day_number = progress.add(commit["sha"], len(platforms))
+            for platform in platforms:
+                # Keep only a bounded number of tasks queued so huge backlogs are not held in memory
+                while len(in_flight) >= workers * 2:
+                    done_futures, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done_futures, progress)
+                future = executor.submit(generate_social_media_post, commit["diff"], platform, day_number)
+                in_flight[future] = (index, commit, platform, day_number)
+
+        while in_flight:
+            done_futures, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done_futures, progress)
+
+    if progress.failed:
+        print(f"\n❌ Catch-up stopped after a failed post. {progress.processed_commits} commits recorded; "
+              f"the next run resumes after {state['last_commit'] or 'the start'}.")
+    elif progress.processed_commits == 0:
+        print("No new commits since the last run. No posts generated.")
+    else:
+        print(f"\n--- Catch-Up Finished: {progress.processed_commits} commits, {processed} posts written to '{output_file}' ---")
+
 if __name__ == "__main__":
-    run_automation()
\ No newline at end of file
+    # cli.py is the preferred entry point ('python cli.py' / 'python cli.py catch-up'): it exits before
+    # importing this module when there are no new commits. Running this file directly keeps working.
+    import argparse
+    from cli import add_catch_up_arguments
+
+    parser = argparse.ArgumentParser(description="Generate social media posts from Git commits.")
+    parser.add_argument('--catch-up', action='store_true',
+                        help="Generate posts for every commit since the last processed one.")
+    add_catch_up_arguments(parser)
+    args = parser.parse_args()
+
+    if args.catch_up:
+        run_catch_up(**{name: value for name, value in vars(args).items() if name != 'catch_up' and value is not None})
+    else:
+        run_automation()
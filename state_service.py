@@ -0,0 +1,127 @@
+import json
+import os
+
+# --- Configuration ---
+REPO_PATH = '.' # Path to your Git repository (current directory), shared by main_automation and cli
+STATE_FILE = 'automation_state.json' # File storing the last processed commit and day number
+LEGACY_DAY_COUNTER_FILE = 'day_counter.txt' # Old integer-only day counter, migrated on first load
+
+def _default_state() -> dict:
+    return {"last_commit": None, "day_number": 0}
+
+def load_state(state_file: str = STATE_FILE) -> dict:
+    """
+    Loads the automation state (last processed commit SHA and day number).
+
+    If no state file exists yet, the day number is migrated from the legacy
+    'day_counter.txt' file so existing counters keep going.
+
+    Args:
+        state_file (str): Path to the JSON state file.
+
+    Returns:
+        dict: A dictionary with the keys 'last_commit' (str or None) and 'day_number' (int).
+    """
+    state = _default_state()
+
+    if os.path.exists(state_file):
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            state["last_commit"] = stored.get("last_commit") or None
+            state["day_number"] = int(stored.get("day_number", 0))
+        except (ValueError, TypeError, AttributeError):
+            print(f"Warning: '{state_file}' contains invalid data. Starting from a fresh state.")
+        return state
+
+    legacy_file = os.path.join(os.path.dirname(state_file), LEGACY_DAY_COUNTER_FILE)
+    if os.path.exists(legacy_file):
+        with open(legacy_file, 'r') as f:
+            try:
+                state["day_number"] = int(f.read().strip())
+            except ValueError:
+                print(f"Warning: '{legacy_file}' contains invalid data. Starting day count from 1.")
+    return state
+
+def save_state(state: dict, state_file: str = STATE_FILE) -> None:
+    """
+    Saves the automation state atomically, so an interrupted run never leaves a half-written file.
+
+    Args:
+        state (dict): The state dictionary as returned by load_state().
+        state_file (str): Path to the JSON state file.
+    """
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({"last_commit": state.get("last_commit"), "day_number": state.get("day_number", 0)}, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+class CommitProgress:
+    """
+    Tracks commits whose posts are generated out of order and advances the stored last commit
+    only once a commit and every older one have all their posts written. A commit with a failed
+    post is never passed, so the next run retries it.
+
+    Finished posts are held per commit and handed to `on_commit` only when that commit is recorded,
+    right before the state is saved. Posts of a commit the state cannot reach yet (because an older
+    commit failed or the run was interrupted) are never written, so a retry does not duplicate them.
+    """
+
+    def __init__(self, state: dict, state_file: str = STATE_FILE, on_commit=None):
+        self.state = state
+        self.state_file = state_file
+        self.on_commit = on_commit # Called with the list of records of each commit as it is recorded
+        self._commits = {} # index -> {"sha", "day_number", "pending", "records"} for commits not yet recorded
+        self._next_index = 0 # index given to the next added commit
+        self._next_to_save = 0 # index of the oldest commit that is not yet recorded in the state
+        self._day_number = state["day_number"]
+        self.failed = False # True once any post failed; the state then stops before that commit
+
+    @property
+    def processed_commits(self) -> int:
+        """Number of commits recorded in the state during this run."""
+        return self._next_to_save
+
+    def add(self, sha: str, pending: int) -> tuple:
+        """
+        Registers the next commit (oldest first) with `pending` posts still to generate.
+
+        Commits without pending posts (e.g. merges with no diff) keep the current day number.
+
+        Returns:
+            tuple: (index, day_number) to pass back to done() and to the post generator.
+        """
+        if pending:
+            self._day_number += 1
+        index = self._next_index
+        self._next_index += 1
+        self._commits[index] = {"sha": sha, "day_number": self._day_number, "pending": pending, "records": []}
+        self._advance()
+        return index, self._day_number
+
+    def done(self, index: int, record=None) -> None:
+        """Marks one post of the commit at `index` as finished, holding `record` until the commit is recorded."""
+        commit = self._commits[index]
+        commit["pending"] -= 1
+        if record is not None:
+            commit["records"].append(record)
+        self._advance()
+
+    def fail(self, index: int) -> None:
+        """Marks a post of the commit at `index` as failed, so the state never advances past it."""
+        self._commits[index]["failed"] = True
+        self.failed = True
+
+    def _advance(self) -> None:
+        advanced = False
+        while (self._next_to_save in self._commits and self._commits[self._next_to_save]["pending"] == 0
+               and not self._commits[self._next_to_save].get("failed")):
+            commit = self._commits.pop(self._next_to_save)
+            if self.on_commit is not None and commit["records"]:
+                self.on_commit(commit["records"])
+            self.state["last_commit"] = commit["sha"]
+            self.state["day_number"] = max(self.state["day_number"], commit["day_number"])
+            self._next_to_save += 1
+            advanced = True
+        if advanced:
+            save_state(self.state, self.state_file)
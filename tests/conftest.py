@@ -0,0 +1,26 @@
+import subprocess
+import pytest
+
+def _git(repo, *args):
+    result = subprocess.run(['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+                            cwd=repo, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+@pytest.fixture
+def git():
+    """Runs a Git command in a repository and returns its output."""
+    return _git
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """Creates a Git repository with one commit per given file content and returns its path."""
+    def make(name='repo', contents=('c1',)):
+        repo = tmp_path / name
+        repo.mkdir(parents=True)
+        _git(repo, 'init', '-q')
+        for i, content in enumerate(contents, start=1):
+            (repo / f"file{i}.txt").write_text(f"{content}\n")
+            _git(repo, 'add', '.')
+            _git(repo, 'commit', '-q', '-m', content)
+        return repo
+    return make
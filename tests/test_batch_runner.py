@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+import pytest
+import batch_runner
+from state_service import load_state, save_state
+
+def _write_manifest(tmp_path, entries):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps(entries))
+    return str(manifest)
+
+def _start_after_first_commit(manifest, repo, git):
+    state_file = batch_runner.get_state_file(manifest, str(repo))
+    (repo.parent / batch_runner.BATCH_STATE_DIR).mkdir(exist_ok=True)
+    save_state({"last_commit": git(repo, 'rev-list', '--max-parents=0', 'HEAD'), "day_number": 0}, state_file)
+    return state_file
+
+def _run(tmp_path, manifest, **options):
+    return batch_runner.run_batch(manifest, requests_per_minute=0, output_file=str(tmp_path / "posts.jsonl"),
+                                  report_file=str(tmp_path / "report.json"), **options)
+
+def _records(tmp_path):
+    with open(tmp_path / "posts.jsonl", encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def _post(diff, platform, day_number):
+    return f"Day {day_number} {platform}"
+
+def test_rate_limiter_spaces_calls_evenly():
+    limiter = batch_runner.RateLimiter(600)
+    times = []
+    for _ in range(3):
+        limiter.acquire()
+        times.append(time.monotonic())
+
+    assert all(later - earlier >= 0.09 for earlier, later in zip(times, times[1:]))
+
+def test_rate_limiter_is_disabled_without_a_quota():
+    limiter = batch_runner.RateLimiter(0)
+    started = time.monotonic()
+    for _ in range(100):
+        limiter.acquire()
+
+    assert time.monotonic() - started < 0.05
+
+@pytest.mark.parametrize("manifest", [
+    ["a", {"path": "nested/../b", "name": "Bee"}],
+    {"repositories": ["a", {"path": "b", "name": "Bee"}]},
+])
+def test_load_manifest_accepts_lists_and_objects(tmp_path, manifest):
+    repositories = batch_runner.load_manifest(_write_manifest(tmp_path, manifest))
+
+    assert repositories == [{"name": "a", "path": str(tmp_path / "a")}, {"name": "Bee", "path": str(tmp_path / "b")}]
+
+def test_load_manifest_keeps_absolute_paths(tmp_path):
+    other = tmp_path / "elsewhere" / "repo"
+    manifest_dir = tmp_path / "manifests"
+    manifest_dir.mkdir()
+
+    assert batch_runner.load_manifest(_write_manifest(manifest_dir, [str(other)])) == [{"name": "repo", "path": str(other)}]
+
+def test_duplicate_paths_are_processed_once(make_repo, tmp_path, monkeypatch):
+    make_repo('a')
+    manifest = _write_manifest(tmp_path, ["a", "./a", {"path": "a", "name": "again"}])
+    monkeypatch.setattr(batch_runner, "generate_social_media_post", _post)
+
+    report = _run(tmp_path, manifest)
+
+    assert [r["name"] for r in report["repositories"]] == ["a"]
+    assert len(_records(tmp_path)) == len(batch_runner.PLATFORMS)
+
+def test_posts_are_generated_round_robin(make_repo, git, tmp_path, monkeypatch):
+    repos = [make_repo(name, contents=[f"{name}{i}" for i in range(4)]) for name in ('a', 'b')]
+    manifest = _write_manifest(tmp_path, ['a', 'b'])
+    for repo in repos:
+        _start_after_first_commit(manifest, repo, git)
+    calls = []
+    lock = threading.Lock()
+
+    def record(diff, platform, day_number):
+        with lock:
+            calls.append('a' if '+a' in diff else 'b')
+        return _post(diff, platform, day_number)
+    monkeypatch.setattr(batch_runner, "generate_social_media_post", record)
+
+    _run(tmp_path, manifest, workers=2)
+
+    # Neither repository gets ahead of the other by more than the calls that can run at once
+    assert len(calls) == 2 * 3 * len(batch_runner.PLATFORMS)
+    assert all(abs(calls[:n].count('a') - calls[:n].count('b')) <= 2 for n in range(len(calls) + 1))
+
+def test_failed_post_stops_only_its_repository_and_retry_does_not_duplicate(make_repo, git, tmp_path, monkeypatch):
+    repos = [make_repo(name, contents=[f"{name}{i}" for i in range(4)]) for name in ('a', 'b')]
+    manifest = _write_manifest(tmp_path, ['a', 'b'])
+    state_files = [_start_after_first_commit(manifest, repo, git) for repo in repos]
+
+    def flaky(diff, platform, day_number):
+        return None if '+a2' in diff and platform == "X" else _post(diff, platform, day_number)
+    monkeypatch.setattr(batch_runner, "generate_social_media_post", flaky)
+
+    report = _run(tmp_path, manifest, workers=2)
+
+    a, b = report["repositories"]
+    assert (a["failed"], a["commits"], a["day_number"]) == (True, 1, 1)
+    assert (b["failed"], b["commits"], b["day_number"]) == (False, 3, 3)
+    assert load_state(state_files[0])["last_commit"] == git(repos[0], 'rev-parse', 'HEAD~2')
+
+    monkeypatch.setattr(batch_runner, "generate_social_media_post", _post)
+    _run(tmp_path, manifest, workers=2)
+
+    pairs = [(record["repository"], record["commit"], record["platform"]) for record in _records(tmp_path)]
+    assert len(pairs) == len(set(pairs)) == 2 * 3 * len(batch_runner.PLATFORMS)
+    assert load_state(state_files[0]) == {"last_commit": git(repos[0], 'rev-parse', 'HEAD'), "day_number": 3}
+
+def test_open_streams_are_capped_by_workers(make_repo, tmp_path, monkeypatch):
+    names = [f"repo{i}" for i in range(6)]
+    for name in names:
+        make_repo(name)
+    manifest = _write_manifest(tmp_path, names)
+    open_streams = []
+    max_open = 0
+    iter_new_commits = batch_runner.iter_new_commits
+
+    def counting(*args, **kwargs):
+        nonlocal max_open
+        open_streams.append(args[0])
+        max_open = max(max_open, len(open_streams))
+        try:
+            yield from iter_new_commits(*args, **kwargs)
+        finally:
+            open_streams.remove(args[0])
+    monkeypatch.setattr(batch_runner, "iter_new_commits", counting)
+    monkeypatch.setattr(batch_runner, "generate_social_media_post", _post)
+
+    report = _run(tmp_path, manifest, workers=2)
+
+    assert max_open <= 2
+    assert open_streams == []
+    assert [r["commits"] for r in report["repositories"]] == [1] * len(names)
+
+def test_repository_errors_are_reported_without_stopping_the_batch(make_repo, tmp_path, monkeypatch):
+    broken = make_repo('broken')
+    make_repo('ok')
+    manifest = _write_manifest(tmp_path, ['broken', 'missing', 'ok'])
+    (tmp_path / batch_runner.BATCH_STATE_DIR).mkdir()
+    save_state({"last_commit": "deadbeef" * 5, "day_number": 2}, batch_runner.get_state_file(manifest, str(broken)))
+    monkeypatch.setattr(batch_runner, "generate_social_media_post", _post)
+
+    report = _run(tmp_path, manifest)
+
+    broken_report, missing_report, ok_report = report["repositories"]
+    assert "cannot be found" in broken_report["error"]
+    assert (broken_report["last_commit"], broken_report["day_number"]) == ("deadbeef" * 5, 2)
+    assert "not a Git repository" in missing_report["error"]
+    assert set(missing_report) == set(ok_report)
+    assert (missing_report["last_commit"], missing_report["day_number"]) == (None, None)
+    assert (ok_report["error"], ok_report["commits"], ok_report["posts"]) == (None, 1, len(batch_runner.PLATFORMS))
+    with open(tmp_path / "report.json", encoding='utf-8') as f:
+        assert json.load(f)["repositories"] == report["repositories"]
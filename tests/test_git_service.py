@@ -0,0 +1,68 @@
+import pytest
+from git_service import COMMIT_SEPARATOR, FIELD_SEPARATOR, GitCommandError, iter_new_commits, parse_git_log
+
+def _header(sha, subject):
+    return f"{COMMIT_SEPARATOR}{sha}{FIELD_SEPARATOR}{subject}\n"
+
+def test_parse_git_log_yields_every_commit_and_drops_deleted_files():
+    lines = [
+        _header("aaa", "add files"),
+        "\n",
+        "diff --git a/a.txt b/a.txt\n",
+        "new file mode 100644\n",
+        "+hello\n",
+        _header("bbb", "delete only"),
+        "\n",
+        "diff --git a/a.txt b/a.txt\n",
+        "deleted file mode 100644\n",
+        "-hello\n",
+        _header("ccc", "empty"),
+        _header("ddd", "modify and delete"),
+        "diff --git a/b.txt b/b.txt\n",
+        "+world\n",
+        "diff --git a/c.txt b/c.txt\n",
+        "deleted file mode 100644\n",
+        "-gone\n",
+    ]
+
+    commits = list(parse_git_log(lines))
+
+    assert [c["sha"] for c in commits] == ["aaa", "bbb", "ccc", "ddd"]
+    assert commits[0]["subject"] == "add files"
+    assert "+hello" in commits[0]["diff"]
+    assert commits[1]["diff"] == ""
+    assert commits[2]["diff"] == ""
+    assert "+world" in commits[3]["diff"]
+    assert "c.txt" not in commits[3]["diff"]
+
+def test_iter_new_commits_includes_delete_only_and_empty_commits(make_repo, git):
+    repo = make_repo(contents=('c1',))
+    c1 = git(repo, 'rev-parse', 'HEAD')
+    (repo / "b.txt").write_text("c2\n")
+    git(repo, 'add', 'b.txt')
+    git(repo, 'commit', '-q', '-m', 'c2')
+    git(repo, 'rm', '-q', 'file1.txt')
+    git(repo, 'commit', '-q', '-m', 'delete-only')
+    git(repo, 'commit', '-q', '--allow-empty', '-m', 'empty')
+
+    commits = list(iter_new_commits(str(repo), since_commit=c1))
+    assert [c["subject"] for c in commits] == ["c2", "delete-only", "empty"]
+    assert "+c2" in commits[0]["diff"]
+    assert commits[1]["diff"] == "" and commits[2]["diff"] == ""
+
+    latest = list(iter_new_commits(str(repo)))
+    assert [c["subject"] for c in latest] == ["empty"]
+
+@pytest.mark.parametrize("since_commit", ["deadbeef" * 5, "file-that-is-not-a-commit"])
+def test_iter_new_commits_raises_for_unknown_since_commit(make_repo, since_commit):
+    repo = make_repo(contents=('c1', 'c2'))
+    with pytest.raises(GitCommandError):
+        list(iter_new_commits(str(repo), since_commit=since_commit))
+
+def test_iter_new_commits_raises_when_since_commit_is_not_an_ancestor(make_repo, git):
+    repo = make_repo(contents=('c1', 'c2'))
+    old_head = git(repo, 'rev-parse', 'HEAD')
+    git(repo, 'commit', '-q', '--amend', '-m', 'rewritten')
+
+    with pytest.raises(GitCommandError, match="not an ancestor"):
+        list(iter_new_commits(str(repo), since_commit=old_head))
@@ -0,0 +1,62 @@
+import pytest
+import insights_service
+from insights_service import _generate_in_background, detect_changes, load_insights_cache, refresh_insights
+
+DATA = {"btc": None, "cpi": {"date": "2026-09-01", "value": 0.3}, "fed_funds": None, "unemployment": None}
+
+def test_failed_generation_is_not_retried_during_cooldown(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "insights_cache.json")
+    monkeypatch.setattr(insights_service, "generate_market_insight", lambda changes: None)
+    _generate_in_background({"version": "v1", "data": DATA}, ["change"], cache_file, 1.0)
+
+    started = []
+    monkeypatch.setattr(insights_service.threading, "Thread", lambda *args, **kwargs: started.append(kwargs))
+    result = refresh_insights({"version": "v1", "data": DATA}, cache_file)
+
+    assert result["failed"] and not result["updating"]
+    assert started == []
+
+def test_latest_only_moves_forward(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "insights_cache.json")
+    monkeypatch.setattr(insights_service, "generate_market_insight", lambda changes: "insight " + changes[0])
+
+    # The newer snapshot finishes first, then the older one
+    _generate_in_background({"version": "new", "data": DATA}, ["new"], cache_file, 2.0)
+    _generate_in_background({"version": "old", "data": DATA}, ["old"], cache_file, 1.0)
+
+    cache = load_insights_cache(cache_file)
+    assert cache["latest"] == "new"
+    assert set(cache["insights"]) == {"new", "old"}
+
+BASELINE = {
+    "btc": {"date": "2026-10-01", "value": 100000.0, "drawdown_pct": -2.0},
+    "cpi": {"date": "2026-08-01", "value": 0.2},
+    "fed_funds": {"date": "2026-09-01", "value": 4.33},
+    "unemployment": {"date": "2026-08-01", "value": 4.2},
+}
+
+def _with(series: str, **values) -> dict:
+    data = {name: dict(summary) for name, summary in BASELINE.items()}
+    data[series].update(values)
+    return data
+
+@pytest.mark.parametrize("current, baseline, expected", [
+    # Identical data is never meaningful
+    (BASELINE, BASELINE, []),
+    # New CPI and unemployment prints
+    (_with("cpi", date="2026-09-01", value=0.4), BASELINE, ["New CPI print for 2026-09-01: monthly inflation 0.40%."]),
+    (_with("unemployment", date="2026-09-01", value=4.3), BASELINE, ["New unemployment print for 2026-09-01: 4.3%."]),
+    # Fed funds moves at, above and below the threshold
+    (_with("fed_funds", value=4.58), BASELINE, ["Effective federal funds rate rose from 4.33% to 4.58% (2026-09-01)."]),
+    (_with("fed_funds", value=4.23), BASELINE, ["Effective federal funds rate fell from 4.33% to 4.23% (2026-09-01)."]),
+    (_with("fed_funds", value=4.40), BASELINE, []),
+    # BTC drawdown crossing the threshold fires once, staying below it does not fire again
+    (_with("btc", value=95000.0, drawdown_pct=-12.0), BASELINE, ["Bitcoin is in a 12.0% drawdown from its peak, at $95,000."]),
+    (_with("btc", value=94000.0, drawdown_pct=-13.0), _with("btc", value=95000.0, drawdown_pct=-12.0), []),
+    # BTC moves since the last insight
+    (_with("btc", value=111000.0), BASELINE, ["Bitcoin moved +11.0% to $111,000 since the last insight."]),
+    (_with("btc", value=89000.0, drawdown_pct=-9.0), BASELINE, ["Bitcoin moved -11.0% to $89,000 since the last insight."]),
+    (_with("btc", value=105000.0), BASELINE, []),
+])
+def test_detect_changes(current, baseline, expected):
+    assert detect_changes(current, baseline) == expected
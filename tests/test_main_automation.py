@@ -0,0 +1,60 @@
+import json
+import pytest
+import main_automation
+from git_service import GitCommandError
+from state_service import STATE_FILE, load_state, save_state
+
+def _start_after_first_commit(repo, git):
+    save_state({"last_commit": git(repo, 'rev-list', '--max-parents=0', 'HEAD'), "day_number": 0},
+               str(repo / STATE_FILE))
+
+def _records(output_file):
+    with open(output_file, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_catch_up_retry_does_not_duplicate_posts(make_repo, git, tmp_path, monkeypatch):
+    repo = make_repo(contents=('c0', 'c1', 'c2', 'c3', 'c4', 'c5'))
+    _start_after_first_commit(repo, git)
+    output_file = str(tmp_path / "posts.jsonl")
+
+    # First run: only the X post of the oldest new commit fails
+    def flaky(diff, platform, day_number):
+        return None if '+c1' in diff and platform == "X" else f"Day {day_number} {platform}"
+    monkeypatch.setattr(main_automation, "generate_social_media_post", flaky)
+    main_automation.run_catch_up(workers=2, output_file=output_file, repo_path=str(repo))
+    assert _records(output_file) == []
+    assert load_state(str(repo / STATE_FILE))["day_number"] == 0
+
+    monkeypatch.setattr(main_automation, "generate_social_media_post", lambda diff, platform, day: f"Day {day} {platform}")
+    main_automation.run_catch_up(workers=2, output_file=output_file, repo_path=str(repo))
+
+    pairs = [(record["commit"], record["platform"]) for record in _records(output_file)]
+    assert len(pairs) == 15
+    assert len(set(pairs)) == 15
+    assert load_state(str(repo / STATE_FILE)) == {"last_commit": git(repo, 'rev-parse', 'HEAD'), "day_number": 5}
+
+def test_catch_up_fails_loudly_for_unreachable_last_commit(make_repo, tmp_path):
+    repo = make_repo(contents=('c0', 'c1'))
+    save_state({"last_commit": "deadbeef" * 5, "day_number": 3}, str(repo / STATE_FILE))
+
+    with pytest.raises(GitCommandError):
+        main_automation.run_catch_up(output_file=str(tmp_path / "posts.jsonl"), repo_path=str(repo))
+
+def test_run_records_an_empty_commit_without_a_new_day(make_repo, git, monkeypatch):
+    repo = make_repo(contents=('c0',))
+    save_state({"last_commit": git(repo, 'rev-parse', 'HEAD'), "day_number": 4}, str(repo / STATE_FILE))
+    git(repo, 'commit', '-q', '--allow-empty', '-m', 'empty')
+    monkeypatch.setattr(main_automation, "REPO_PATH", str(repo))
+    monkeypatch.setattr(main_automation, "generate_social_media_post", lambda *args: pytest.fail("no post expected"))
+
+    main_automation.run_automation()
+
+    assert load_state(str(repo / STATE_FILE)) == {"last_commit": git(repo, 'rev-parse', 'HEAD'), "day_number": 4}
+
+def test_run_fails_loudly_for_unreachable_last_commit(make_repo, monkeypatch):
+    repo = make_repo(contents=('c0', 'c1'))
+    save_state({"last_commit": "deadbeef" * 5, "day_number": 3}, str(repo / STATE_FILE))
+    monkeypatch.setattr(main_automation, "REPO_PATH", str(repo))
+
+    with pytest.raises(GitCommandError):
+        main_automation.run_automation()
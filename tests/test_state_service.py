@@ -0,0 +1,55 @@
+from state_service import CommitProgress, load_state
+
+def _progress(tmp_path, last_commit=None, day_number=0):
+    state_file = str(tmp_path / "automation_state.json")
+    return CommitProgress({"last_commit": last_commit, "day_number": day_number}, state_file), state_file
+
+def test_state_advances_only_over_contiguous_finished_commits(tmp_path):
+    progress, state_file = _progress(tmp_path, day_number=5)
+    first, first_day = progress.add("c1", 2)
+    second, second_day = progress.add("c2", 1)
+    assert (first_day, second_day) == (6, 7)
+
+    progress.done(second)
+    assert progress.processed_commits == 0
+    progress.done(first)
+    assert progress.processed_commits == 0
+    progress.done(first)
+
+    assert progress.processed_commits == 2
+    assert load_state(state_file) == {"last_commit": "c2", "day_number": 7}
+
+def test_commits_without_posts_are_recorded_without_a_new_day(tmp_path):
+    progress, state_file = _progress(tmp_path, last_commit="c0", day_number=3)
+    index, day_number = progress.add("c1", 1)
+    progress.add("empty", 0)
+    progress.done(index)
+
+    assert day_number == 4
+    assert load_state(state_file) == {"last_commit": "empty", "day_number": 4}
+
+def test_failed_commit_blocks_the_state(tmp_path):
+    progress, state_file = _progress(tmp_path, last_commit="c0", day_number=1)
+    first, _ = progress.add("c1", 1)
+    second, _ = progress.add("c2", 1)
+    third, _ = progress.add("c3", 1)
+
+    progress.done(first)
+    progress.fail(second)
+    progress.done(third)
+
+    assert progress.failed
+    assert progress.processed_commits == 1
+    assert load_state(state_file) == {"last_commit": "c1", "day_number": 2}
+
+def test_records_are_handed_over_only_when_the_commit_is_recorded(tmp_path):
+    written = []
+    state_file = str(tmp_path / "automation_state.json")
+    progress = CommitProgress({"last_commit": None, "day_number": 0}, state_file, on_commit=written.append)
+    first, _ = progress.add("c1", 1)
+    second, _ = progress.add("c2", 1)
+
+    progress.done(second, "c2-post")
+    assert written == []
+    progress.fail(first)
+    assert written == []